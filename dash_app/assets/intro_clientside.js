@@ -0,0 +1,39 @@
+// Client-side versions of the intro-page callbacks. The button fade-in and
+// the fade-out/redirect are pure UI, so running them in the browser avoids
+// a server round-trip for each.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    intro: {
+        show_button: function (n_intervals) {
+            if (n_intervals > 0) {
+                return [
+                    {
+                        marginTop: "20px",
+                        padding: "10px 20px",
+                        fontSize: "16px",
+                        backgroundColor: "#1DB954",  // Spotify green
+                        color: "black",
+                        border: "none",
+                        borderRadius: "5px",
+                        cursor: "pointer",
+                        display: "inline-block",  // Make the button visible
+                    },
+                    "fade-in",  // Add the fade-in animation class
+                ];
+            }
+            return [{ display: "none" }, ""];  // Keep hidden until timer fires
+        },
+        handle_click: function (n_clicks) {
+            if (n_clicks) {
+                // Fade out the intro page, then navigate to the main app
+                return [
+                    { opacity: "0", transition: "opacity 1s ease-in-out" },
+                    "/main",
+                ];
+            }
+            return [
+                window.dash_clientside.no_update,
+                window.dash_clientside.no_update,
+            ];
+        },
+    },
+});
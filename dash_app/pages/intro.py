@@ -1,4 +1,4 @@
-from dash import html, dcc, Input, Output, callback
+from dash import html, dcc, Input, Output, ClientsideFunction, clientside_callback
 import dash
 
 dash.register_page(__name__, path="/")  # Registers this as the root page
@@ -44,36 +44,20 @@ layout = html.Div(
     ]
 )
 
+# Both callbacks are pure UI (fade the button in, fade the page out and
+# redirect), so they run in the browser via assets/intro_clientside.js
+# instead of costing a server round-trip each.
+
 # Callback to show button after the timer completes
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="intro", function_name="show_button"),
     [Output("enter-button", "style"), Output("enter-button", "className")],
     Input("show-button-timer", "n_intervals"),
 )
-def show_button(n_intervals):
-    if n_intervals > 0:
-        return (
-            {
-                'marginTop': '20px',
-                'padding': '10px 20px',
-                'fontSize': '16px',
-                'backgroundColor': '#1DB954',  # Spotify green
-                'color': 'black',
-                'border': 'none',
-                'borderRadius': '5px',
-                'cursor': 'pointer',
-                'display': 'inline-block',  # Make the button visible
-            },
-            "fade-in",  # Add the fade-in animation class
-        )
-    return {'display': 'none'}, ""  # Keep hidden until timer fires
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="intro", function_name="handle_click"),
     Output("intro-page", "style"),
     Output("url", "pathname"),
     Input("enter-button", "n_clicks"),
 )
-def handle_button_click(n_clicks):
-    if n_clicks:
-        # Fade out the intro page, then navigate to the main app
-        return {'opacity': '0', 'transition': 'opacity 1s ease-in-out'}, "/main"
-    return dash.no_update, dash.no_update